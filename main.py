@@ -1,245 +1,415 @@
-import csv, io, os
-from datetime import datetime, timedelta, timezone
+import bisect, calendar, csv, logging, os, pickle, re, sys, time
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+from operator import itemgetter
 try:
     from zoneinfo import ZoneInfo
 except ImportError:
     # Fallback for Python < 3.9
     ZoneInfo = None
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Config from environment
 CSV_URL = os.environ["SHEET_CSV_URL"]
 BOT_TOKEN = os.environ["TELEGRAM_BOT_TOKEN"]
 CHAT_ID   = os.environ["TELEGRAM_CHAT_ID"]
+SEND_MESSAGE_URL = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
+
+# Per-row diagnostics are only printed with BOT_DEBUG set; disabled log.debug
+# calls return before formatting anything, keeping the parse loop quiet
+DEBUG = bool(os.environ.get("BOT_DEBUG"))
+log = logging.getLogger("bot")
+
+# Kyiv time zone, loaded once; None when zoneinfo or its tz database is missing
+KYIV_TZ = None
+if ZoneInfo:
+    try:
+        KYIV_TZ = ZoneInfo("Europe/Kyiv")
+    except KeyError:  # ZoneInfoNotFoundError, e.g. Windows without tzdata
+        pass
+
+# Last parsed sheet and its ETag/Last-Modified, kept next to the script
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".birthday_cache.pkl")
+# Seconds a cached sheet is reused without even revalidating; 0 always asks the server
+CACHE_TTL = int(os.environ.get("BIRTHDAY_CACHE_TTL", "3600"))
+
+# (connect, read) timeout for every HTTP call so a stalled host can't hang the run
+TIMEOUT = (3.05, 10)
+# The sheet export can be slow to start, so give it a longer read timeout
+CSV_TIMEOUT = (3.05, 30)
+# Read the streamed CSV in 64 KiB blocks (iter_lines defaults to 512 bytes)
+CSV_CHUNK_SIZE = 64 * 1024
+
+# Retry throttled (429) and transient 5xx responses to the sheet download
+# with backoff, honouring Retry-After
+RETRY = Retry(total=3, backoff_factor=0.2,
+              status_forcelist=(429, 500, 502, 503, 504),
+              allowed_methods=frozenset({"GET"}))
+# sendMessage is only retried on 429, which Telegram never processes; after a
+# read timeout or 5xx the message may already be delivered, so don't resend it
+TELEGRAM_RETRY = Retry(total=3, read=0, backoff_factor=0.2,
+                       status_forcelist=(429,),
+                       allowed_methods=frozenset({"POST"}))
+
+# One keep-alive session for all calls: reuses the TCP + TLS connection
+# instead of paying a fresh handshake for every Telegram message.
+# Plain http:// sheet URLs get the same pooling and retries.
+SESSION = requests.Session()
+ADAPTER = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=RETRY)
+TELEGRAM_ADAPTER = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=TELEGRAM_RETRY)
+SESSION.mount("https://", ADAPTER)
+SESSION.mount("http://", ADAPTER)
+SESSION.mount("https://api.telegram.org/", TELEGRAM_ADAPTER)
+
+# Separator between reminders batched into one message
+REMINDER_SEPARATOR = "\n\n――\n\n"
+
+# Accepted (lowercase) header spellings for each logical column, in priority order
+COLUMN_ALIASES = {
+    "name": ("ім'я", "name", "імя"),
+    "birthday": ("дата народження", "birthday", "дата"),
+    "phone": ("телефон", "phone", "номер телефону"),
+    "telegram": ("telegram", "tg", "телеграм", "telegram id"),
+}
+
+# One parsed sheet row; phone and telegram are "" when absent
+Person = namedtuple("Person", "name birthday phone telegram")
+
+# Bump when the cached birthdays change shape so stale caches are ignored
+CACHE_VERSION = 2
+
+# Keep messages well under Telegram's 4096 character limit
+MESSAGE_LIMIT = 3500
+
+# Days before a birthday on which a reminder (or the greeting, at 0) goes out
+REMINDER_DAYS = frozenset((0, 1, 7))
+
+# Ages that get a milestone banner
+MILESTONE_AGES = frozenset((18, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 100))
+
+# Characters stripped from phone numbers before normalising them
+_PHONE_TABLE = str.maketrans('', '', ' -()')
+# Ukrainian number: optional +, optional 380 country code, 9 subscriber digits
+_PHONE_RE = re.compile(r'^\+?(?:380)?(\d{9})$')
+
+# Birthday cell: YYYY-MM-DD (4-digit year only), or DD.MM.YYYY / DD/MM/YYYY
+# with a 2- or 4-digit year
+_ISO_DATE_RE = re.compile(r'^\s*(\d{4})-(\d{1,2})-(\d{1,2})\s*$')
+_DATE_RE = re.compile(r'^\s*(\d{1,2})([./])(\d{1,2})\2(\d{1,4})\s*$')
+
+def configure_logging():
+    """Send log records to stdout alongside the bot's progress prints"""
+    logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO,
+                        format="%(message)s", stream=sys.stdout)
+
+def kyiv_today():
+    """Today's date in Kyiv"""
+    if KYIV_TZ:
+        return datetime.now(KYIV_TZ).date()
+    # Fallback to UTC+3 (Kyiv is typically UTC+2 or UTC+3 depending on DST)
+    return (datetime.now(timezone.utc) + timedelta(hours=3)).date()
+
+def load_cache():
+    """Sheet cached by the last run for CSV_URL, or None"""
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            cache = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable birthday cache: {e}")
+        return None
+    if cache.get("version") != CACHE_VERSION or cache.get("url") != CSV_URL:
+        return None
+    # Stored as plain tuples so the cache loads whichever script wrote it
+    cache["birthdays"] = [Person(*entry) for entry in cache["birthdays"]]
+    return cache
+
+def save_cache(response, birthdays):
+    """Store the parsed sheet with its HTTP validators for the next run"""
+    cache = {
+        "version": CACHE_VERSION,
+        "url": CSV_URL,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "birthdays": [tuple(person) for person in birthdays],
+    }
+    try:
+        with open(CACHE_FILE, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"⚠️ Could not write birthday cache: {e}")
+
+def fetch_birthdays_cached(ttl=CACHE_TTL):
+    """Like fetch_birthdays, but reuse a cache younger than ttl seconds without any request"""
+    try:
+        age = time.time() - os.path.getmtime(CACHE_FILE)
+    except OSError:
+        age = None
+    if age is not None and age < ttl:
+        cache = load_cache()
+        if cache:
+            print(f"Using birthdays cached {int(age)}s ago (BIRTHDAY_CACHE_TTL={ttl})")
+            return cache["birthdays"]
+    return fetch_birthdays()
 
 def fetch_birthdays():
     print(f"Fetching CSV from: {CSV_URL}")
-    r = requests.get(CSV_URL)
-    r.raise_for_status()
-    print(f"CSV response status: {r.status_code}")
-    print(f"CSV content length: {len(r.text)} characters")
-    
-    # Try to detect and fix encoding issues
-    text_content = r.text
-    if r.encoding:
-        print(f"Response encoding: {r.encoding}")
     
-    # Try UTF-8 decoding if there are encoding issues
-    try:
-        if r.content:
-            text_content = r.content.decode('utf-8')
-            print("Successfully decoded as UTF-8")
-    except UnicodeDecodeError:
-        try:
-            text_content = r.content.decode('windows-1251')
-            print("Decoded as Windows-1251")
-        except UnicodeDecodeError:
-            print("Using original text content")
-    
-    print(f"First 200 characters of CSV: {text_content[:200]}")
-    
-    data = csv.DictReader(io.StringIO(text_content))
+    # Revalidate the cached copy so an unchanged sheet costs a bodiless 304
+    cache = load_cache()
+    headers = {}
+    if cache and cache["etag"]:
+        headers["If-None-Match"] = cache["etag"]
+    if cache and cache["last_modified"]:
+        headers["If-Modified-Since"] = cache["last_modified"]
+    
+    # Stream the body so rows are parsed as they arrive instead of buffering
+    # (and decoding) the whole sheet first
+    with SESSION.get(CSV_URL, headers=headers, stream=True, timeout=CSV_TIMEOUT) as r:
+        if r.status_code == 304 and cache:
+            print("CSV not modified since last run, reusing cached birthdays")
+            # The cached copy was just confirmed current, so restart its TTL
+            os.utime(CACHE_FILE)
+            return cache["birthdays"]
+        r.raise_for_status()
+        print(f"CSV response status: {r.status_code}")
+        # Google Sheets exports UTF-8; without an explicit charset requests
+        # would fall back to ISO-8859-1 and mangle Cyrillic names
+        r.encoding = 'utf-8'
+        lines = r.iter_lines(chunk_size=CSV_CHUNK_SIZE, decode_unicode=True)
+        birthdays = parse_birthdays(csv.reader(lines))
+    
+    save_cache(r, birthdays)
+    return birthdays
+
+def resolve_columns(header):
+    """Map each logical column to the index of its first alias in the CSV header"""
+    # Normalise the header once so matching ignores case and stray spaces
+    positions = {}
+    for index, column in enumerate(header or ()):
+        positions.setdefault(column.strip().lower(), index)
+    return {key: next((positions[alias] for alias in aliases if alias in positions), None)
+            for key, aliases in COLUMN_ALIASES.items()}
+
+def get_cell(row, index):
+    """Stripped cell at index, or "" if the sheet lacks the column or the row is short"""
+    if index is None or index >= len(row):
+        return ""
+    return row[index].strip()
+
+def parse_birthdays(rows):
+    """Parse csv.reader rows (header first) into Person records"""
+    # Plain lists indexed by position: no per-row dict like DictReader builds
+    header = next(rows, None)
+    columns = resolve_columns(header)
+    found = {key: header[index] for key, index in columns.items() if index is not None}
+    print(f"Resolved columns: {found}")
+    name_col, birthday_col = columns["name"], columns["birthday"]
+    phone_col, telegram_col = columns["phone"], columns["telegram"]
     
     birthdays = []
     row_count = 0
-    for row in data:
+    for row in rows:
+        if not row:
+            continue  # blank line
         row_count += 1
-        print(f"Processing row {row_count}: {row}")
-        
-        # Try different possible column names for name (Ukrainian)
-        name = (row.get("Ім'я") or row.get("name") or row.get("Name") or 
-                row.get("ім'я") or row.get("NAME") or row.get("Імя"))
+        log.debug("Processing row %d: %s", row_count, row)
         
-        # Try different possible column names for birthday
-        birthday = (row.get("Дата народження") or row.get("Birthday") or 
-                   row.get("birthday") or row.get("дата народження") or 
-                   row.get("BIRTHDAY") or row.get("Дата"))
+        # Strip only the cells we use instead of normalising the whole row
+        name = get_cell(row, name_col)
+        birthday = get_cell(row, birthday_col)
         
         if name and birthday:
             try:
-                # Try multiple date formats
+                # YYYY-MM-DD first, then DD.MM.YYYY and DD/MM/YYYY
                 bday_date = None
-                birthday = birthday.strip()
-                
-                # Try ISO format first (YYYY-MM-DD)
-                if '-' in birthday and len(birthday) == 10:
-                    bday_date = datetime.fromisoformat(birthday).date()
-                # Try DD.MM.YYYY format
-                elif '.' in birthday:
-                    parts = birthday.split('.')
-                    if len(parts) == 3:
-                        day, month, year = parts
-                        if len(year) == 2:
-                            year = f"19{year}" if int(year) > 50 else f"20{year}"
-                        bday_date = datetime(int(year), int(month), int(day)).date()
-                # Try DD/MM/YYYY format
-                elif '/' in birthday:
-                    parts = birthday.split('/')
-                    if len(parts) == 3:
-                        day, month, year = parts
+                m = _ISO_DATE_RE.match(birthday)
+                if m:
+                    year, month, day = map(int, m.groups())
+                    bday_date = date(year, month, day)
+                else:
+                    m = _DATE_RE.match(birthday)
+                    if m:
+                        day, _, month, year = m.groups()
                         if len(year) == 2:
-                            year = f"19{year}" if int(year) > 50 else f"20{year}"
-                        bday_date = datetime(int(year), int(month), int(day)).date()
+                            year = int(year) + (1900 if int(year) > 50 else 2000)
+                        bday_date = date(int(year), int(month), int(day))
                 
                 if bday_date:
-                    birthdays.append((name, bday_date, row))
-                    print(f"  ✅ Added: {name} - {bday_date}")
+                    birthdays.append(Person(name, bday_date, get_cell(row, phone_col),
+                                            get_cell(row, telegram_col)))
+                    log.debug("  ✅ Added: %s - %s", name, bday_date)
                 else:
-                    print(f"  ❌ Could not parse date format: {birthday}")
+                    log.warning("  ❌ Could not parse date format for %s: %s", name, birthday)
                     
-            except (ValueError, IndexError) as e:
-                print(f"  ❌ Invalid date format for {name}: {birthday} - Error: {e}")
+            except ValueError as e:
+                log.warning("  ❌ Invalid date format for %s: %s - Error: %s", name, birthday, e)
                 continue
         else:
-            print(f"  ⚠️ Missing required fields in row: {row}")
-            print(f"    Name found: {name}")
-            print(f"    Birthday found: {birthday}")
+            log.debug("  ⚠️ Missing required fields in row: %s (name: %s, birthday: %s)", row, name, birthday)
     
-    print(f"Total rows processed: {row_count}")
-    print(f"Valid birthdays found: {len(birthdays)}")
+    # Keep the list in calendar order so reminder lookups can bisect it
+    birthdays.sort(key=lambda person: (person.birthday.month, person.birthday.day))
+    
+    log.info("Parsed %d valid birthdays from %d rows", len(birthdays), row_count)
     return birthdays
 
-def calculate_age(birthdate, target_date):
-    return target_date.year - birthdate.year - ((target_date.month, target_date.day) < (birthdate.month, birthdate.day))
+def birthday_in_year(bday, year):
+    """Anniversary of bday in year; Feb 29 birthdays fall on Mar 1 in common years"""
+    if bday.month == 2 and bday.day == 29 and not calendar.isleap(year):
+        return date(year, 3, 1)
+    return bday.replace(year=year)
+
+def next_birthday(bday, today):
+    """First anniversary of bday on or after today"""
+    next_bday = birthday_in_year(bday, today.year)
+    # If birthday already passed this year, use next year's
+    if next_bday < today:
+        next_bday = birthday_in_year(bday, today.year + 1)
+    return next_bday
 
 def is_milestone_age(age):
-    return age in [18, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 100]
+    return age in MILESTONE_AGES
 
-def format_person_info(name, row):
-    """Format Ukrainian person information from CSV row"""
-    info_lines = [f"👤 {name}"]
-    
-    # Get phone number (+380 format)
-    phone_fields = ["Телефон", "телефон", "Phone", "phone", "Номер телефону", "номер телефону"]
-    phone = None
-    for field in phone_fields:
-        if row.get(field) and row.get(field).strip():
-            phone = row.get(field).strip()
-            break
-    
-    # Get telegram ID (@nickname format)  
-    telegram_fields = ["Telegram", "telegram", "TG", "tg", "Телеграм", "телеграм", "Telegram ID", "telegram id"]
-    telegram = None
-    for field in telegram_fields:
-        if row.get(field) and row.get(field).strip():
-            telegram = row.get(field).strip()
-            break
+def format_person_info(person):
+    """Format Ukrainian person information"""
+    # Phone number (+380 format) and telegram ID (@nickname format)
+    phone = person.phone
+    telegram = person.telegram
     
     # Add phone if available (handle missing + symbol for Ukrainian numbers)
+    phone_part = ""
     if phone:
-        # Remove any spaces, dashes, or parentheses
-        clean_phone = phone.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+        # Remove any spaces, dashes, or parentheses in a single pass
+        clean_phone = phone.translate(_PHONE_TABLE)
         
-        # If it's a Ukrainian number without +, add it
-        if clean_phone.startswith("380") and not clean_phone.startswith("+"):
-            clean_phone = f"+{clean_phone}"
-        elif not clean_phone.startswith("+") and len(clean_phone) == 9:
-            # If it's 9 digits (without country code), add +380
-            clean_phone = f"+380{clean_phone}"
+        # Ukrainian numbers with or without + / 380 become +380XXXXXXXXX;
+        # anything else is shown as written
+        m = _PHONE_RE.match(clean_phone)
+        if m:
+            clean_phone = f"+380{m.group(1)}"
         
-        info_lines.append(f"📞 Phone: {clean_phone}")
+        phone_part = f"\n📞 Phone: {clean_phone}"
     
     # Add telegram if available
+    telegram_part = ""
     if telegram:
         # Ensure @ symbol is present
         if not telegram.startswith('@'):
             telegram = f"@{telegram}"
-        info_lines.append(f"💬 Telegram: {telegram}")
+        telegram_part = f"\n💬 Telegram: {telegram}"
     
-    return "\n".join(info_lines)
+    return f"👤 {person.name}{phone_part}{telegram_part}"
 
 def send_message(text):
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
     payload = {"chat_id": CHAT_ID, "text": text}
-    print(f"Sending message to chat {CHAT_ID}: {text}")
+    print(f"Sending message to chat {CHAT_ID} ({len(text)} chars)")
+    log.debug("Message text:\n%s", text)
     try:
-        response = requests.post(url, json=payload)
+        response = SESSION.post(SEND_MESSAGE_URL, json=payload, timeout=TIMEOUT)
         response.raise_for_status()
-        print(f"✅ Message sent successfully! Response: {response.json()}")
+        # Only the status matters; don't decode the JSON body unless debugging
+        print("✅ Message sent successfully!")
+        log.debug("Telegram response: %s", response.content)
     except Exception as e:
         print(f"❌ Failed to send message: {e}")
         if hasattr(e, 'response') and e.response:
             print(f"Response content: {e.response.text}")
         raise
 
-def send_all_birthdays_list(birthdays, today):
+def enrich(birthdays, today):
+    """Precompute (person, next_bday, delta, age) for every birthday"""
+    enriched = []
+    for person in birthdays:
+        next_bday = next_birthday(person.birthday, today)
+        delta = (next_bday - today).days
+        log.debug("  %s: %s -> Next: %s (in %d days)", person.name, person.birthday, next_bday, delta)
+        # next_bday is the anniversary itself, so the age is just the year difference
+        enriched.append((person, next_bday, delta, next_bday.year - person.birthday.year))
+    return enriched
+
+def split_into_chunks(parts, limit=MESSAGE_LIMIT, separator="\n"):
+    """Yield groups of parts whose separator-joined length stays within limit"""
+    chunk = []
+    size = 0
+    for part in parts:
+        if chunk and size + len(part) + len(separator) > limit:
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(part)
+        size += len(part) + len(separator)
+    if chunk:
+        yield chunk
+
+def send_batched(blocks):
+    """Send blocks joined into as few messages as fit; returns the message count"""
+    count = 0
+    for chunk in split_into_chunks(blocks, separator=REMINDER_SEPARATOR):
+        send_message(REMINDER_SEPARATOR.join(chunk))
+        count += 1
+    return count
+
+def find_due_birthdays(birthdays, today):
+    """Enriched entries for birthdays exactly REMINDER_DAYS away from today
+    
+    Expects birthdays sorted by (month, day), as returned by fetch_birthdays,
+    so each target day is a bisect away instead of a scan over every row.
+    """
+    keys = [(person.birthday.month, person.birthday.day) for person in birthdays]
+    due = []
+    for delta in sorted(REMINDER_DAYS):
+        next_bday = today + timedelta(days=delta)
+        day_keys = [(next_bday.month, next_bday.day)]
+        # Feb 29 birthdays are celebrated on Mar 1 in common years
+        if day_keys[0] == (3, 1) and not calendar.isleap(next_bday.year):
+            day_keys.insert(0, (2, 29))
+        for key in day_keys:
+            start = bisect.bisect_left(keys, key)
+            end = bisect.bisect_right(keys, key, start)
+            for person in birthdays[start:end]:
+                due.append((person, next_bday, delta, next_bday.year - person.birthday.year))
+    return due
+
+def send_all_birthdays_list(enriched):
     """Send a formatted list of all birthdays with days remaining"""
-    if not birthdays:
+    if not enriched:
         send_message("📋 Birthday List\n\nNo birthdays found in database.")
         return
     
-    # Calculate days for all birthdays and sort by next occurrence
-    birthday_info = []
-    for name, bday, row in birthdays:
-        next_bday = bday.replace(year=today.year)
-        if next_bday < today:
-            next_bday = bday.replace(year=today.year + 1)
-        
-        delta = (next_bday - today).days
-        age = calculate_age(bday, next_bday)
-        
-        # Format each birthday entry
+    # Format each birthday entry, sorted by days remaining (closest first)
+    birthday_lines = []
+    for person, next_bday, delta, age in sorted(enriched, key=itemgetter(2)):
         milestone_indicator = " 🎊" if is_milestone_age(age) else ""
-        birthday_info.append((delta, f"• {name}: {next_bday:%d.%m} ({delta} days){milestone_indicator}"))
-    
-    # Sort by days remaining (closest first)
-    birthday_info.sort(key=lambda x: x[0])
-    
-    # Create the message
-    message_lines = ["📋 All Birthdays List\n"]
-    
-    for _, birthday_line in birthday_info:
-        message_lines.append(birthday_line)
-    
-    message = "\n".join(message_lines)
-    
-    # Split message if too long (Telegram limit is ~4000 characters)
-    if len(message) > 3500:
-        # Send in chunks
-        chunk_lines = ["📋 All Birthdays List (Part 1)\n"]
-        current_length = len(chunk_lines[0])
-        part_num = 1
-        
-        for _, birthday_line in birthday_info:
-            if current_length + len(birthday_line) + 1 > 3500:
-                # Send current chunk
-                send_message("\n".join(chunk_lines))
-                # Start new chunk
-                part_num += 1
-                chunk_lines = [f"📋 All Birthdays List (Part {part_num})\n"]
-                current_length = len(chunk_lines[0])
-            
-            chunk_lines.append(birthday_line)
-            current_length += len(birthday_line) + 1
-        
-        # Send final chunk
-        if len(chunk_lines) > 1:
-            send_message("\n".join(chunk_lines))
-    else:
-        send_message(message)
+        birthday_lines.append(f"• {person.name}: {next_bday:%d.%m} ({delta} days){milestone_indicator}")
+    
+    # Split in a single pass, keeping room for the "(Part N)" title on each chunk
+    title = "📋 All Birthdays List"
+    limit = MESSAGE_LIMIT - len(title) - len(" (Part 99)\n\n")
+    chunks = list(split_into_chunks(birthday_lines, limit))
+    for part_num, chunk in enumerate(chunks, 1):
+        chunk_title = title if len(chunks) == 1 else f"{title} (Part {part_num})"
+        send_message(f"{chunk_title}\n\n" + "\n".join(chunk))
 
 def main():
+    configure_logging()
     print("🤖 Birthday Bot Starting...")
     print(f"Bot Token: {BOT_TOKEN[:10]}...")
     print(f"Chat ID: {CHAT_ID}")
     print(f"CSV URL: {CSV_URL}")
     
     # Use timezone-aware datetime (Kyiv time)
-    try:
-        # Try using ZoneInfo first (Python 3.9+)
-        kyiv_tz = ZoneInfo("Europe/Kyiv")
-        today = datetime.now(kyiv_tz).date()
-        print(f"Today's date (Kyiv timezone): {today}")
-    except (NameError, AttributeError):
-        # Fallback to UTC+3 (Kyiv is typically UTC+2 or UTC+3 depending on DST)
-        today = (datetime.now(timezone.utc) + timedelta(hours=3)).date()
-        print(f"Today's date (UTC+3 fallback): {today}")
+    today = kyiv_today()
+    print(f"Today's date ({'Kyiv timezone' if KYIV_TZ else 'UTC+3 fallback'}): {today}")
     
     print(f"Day of week: {today.strftime('%A')} (0=Monday, 6=Sunday: {today.weekday()})")
     
     # Fetch birthdays
     try:
-        birthdays = fetch_birthdays()
+        birthdays = fetch_birthdays_cached()
     except Exception as e:
         print(f"❌ Error fetching birthdays: {e}")
         error_msg = f"🤖 Birthday Bot Error: Failed to fetch birthdays.\n\n📅 Today: {today}\n❌ Error: {str(e)}"
@@ -253,91 +423,80 @@ def main():
         return
     
     print(f"Today's date: {today}")
-    print(f"Found {len(birthdays)} birthdays in CSV:")
+    print(f"Found {len(birthdays)} birthdays in CSV")
     
-    # Debug: Show all found birthdays with calculations
-    for name, bday, row in birthdays:
-        next_bday = bday.replace(year=today.year)
-        if next_bday < today:
-            next_bday = bday.replace(year=today.year + 1)
-        delta = (next_bday - today).days
-        print(f"  DEBUG: {name}: {bday} -> Next: {next_bday} (in {delta} days)")
+    # Birthdays are sorted by calendar day, so the due ones are found by bisection
+    due = find_due_birthdays(birthdays, today)
     
     # Track what messages we need to send
     messages_sent = []
+    reminder_blocks = []
     reminders_sent = 0
     birthday_greetings_sent = 0
     
     # Check for birthday reminders and greetings
-    for name, bday, row in birthdays:
-        next_bday = bday.replace(year=today.year)
-        # If birthday already passed this year, check next year
-        if next_bday < today:
-            next_bday = bday.replace(year=today.year + 1)
-            
-        delta = (next_bday - today).days
-        print(f"  {name}: {bday} -> Next: {next_bday} (in {delta} days)")
-        
+    for person, next_bday, delta, age in due:
+        name = person.name
         if delta == 7:
-            person_info = format_person_info(name, row)
+            person_info = format_person_info(person)
             
-            # Calculate age and check if it's a milestone
-            age = calculate_age(bday, next_bday)
+            # Check if it's a milestone
             milestone_text = ""
             if is_milestone_age(age):
                 milestone_text = f"\n🎊 MILESTONE BIRTHDAY! Turning {age}! 🎊"
             
             message = f"❗ Birthday Reminder (7 days left)\n\n{person_info}\n\n❗ Birthday: {next_bday:%Y-%m-%d}{milestone_text}"
-            send_message(message)
+            reminder_blocks.append(message)
             messages_sent.append(f"7-day reminder for {name}")
-            print(f"  ✅ Sent 7-day reminder for {name}")
+            print(f"  ✅ Queued 7-day reminder for {name}")
             reminders_sent += 1
             
         elif delta == 1:
-            person_info = format_person_info(name, row)
+            person_info = format_person_info(person)
             
-            # Calculate age and check if it's a milestone
-            age = calculate_age(bday, next_bday)
+            # Check if it's a milestone
             milestone_text = ""
             if is_milestone_age(age):
                 milestone_text = f"\n🎊 MILESTONE BIRTHDAY! Turning {age}! 🎊"
             
             message = f"❗ Birthday Reminder (1 day left)\n\n{person_info}\n\n❗ Birthday: {next_bday:%Y-%m-%d}{milestone_text}"
-            send_message(message)
+            reminder_blocks.append(message)
             messages_sent.append(f"1-day reminder for {name}")
-            print(f"  ✅ Sent 1-day reminder for {name}")
+            print(f"  ✅ Queued 1-day reminder for {name}")
             reminders_sent += 1
             
         elif delta == 0:
-            person_info = format_person_info(name, row)
+            person_info = format_person_info(person)
             
-            # Calculate age and check if it's a milestone
-            age = calculate_age(bday, next_bday)
+            # Check if it's a milestone
             milestone_text = ""
             if is_milestone_age(age):
                 milestone_text = f"\n🎊 MILESTONE BIRTHDAY! They're turning {age} today! 🎊"
             
             message = f"🎉 Happy Birthday! 🎉\n\n{person_info}\n\n🎂 Don't forget to greet!{milestone_text}"
-            send_message(message)
+            reminder_blocks.append(message)
             messages_sent.append(f"Birthday greeting for {name}")
-            print(f"  🎉 Sent birthday greeting for {name}")
+            print(f"  🎉 Queued birthday greeting for {name}")
             birthday_greetings_sent += 1
     
     # Check if it's Sunday (6) and send weekly birthday list
     is_sunday = today.weekday() == 6  # Sunday = 6 (Monday=0, Tuesday=1, ..., Sunday=6)
+    batch_count = 0
     if is_sunday:
+        # Reminders go out first so today's greetings aren't buried under the list
+        if reminder_blocks:
+            batch_count += send_batched(reminder_blocks)
         print("📅 It's Sunday! Sending weekly birthday list...")
         weekly_header = f"📅 Weekly Birthday Overview - {today.strftime('%B %d, %Y')}\n\nHere's your complete birthday list with days remaining:"
         send_message(weekly_header)
-        send_all_birthdays_list(birthdays, today)
+        send_all_birthdays_list(enrich(birthdays, today))
         messages_sent.append("Weekly birthday list")
         print("✅ Sent weekly birthday list")
     
     # Calculate next scheduled run time (daily at 06:00 UTC = 09:00 Kyiv)
     try:
-        if ZoneInfo:
-            kyiv_tz = ZoneInfo("Europe/Kyiv")
-            now_kyiv = datetime.now(kyiv_tz)
+        if KYIV_TZ:
+            now_kyiv = datetime.now(KYIV_TZ)
             current_time_str = now_kyiv.strftime('%Y-%m-%d %H:%M:%S Kyiv')
             next_run_kyiv = now_kyiv.replace(hour=9, minute=0, second=0, microsecond=0)
             # If it's already past 09:00 Kyiv today, schedule for tomorrow
@@ -372,9 +531,16 @@ def main():
         control_parts.append("✅ No upcoming birthdays today")
     
     control_msg = "\n".join(control_parts)
-    send_message(control_msg)
     
-    print(f"✅ Sent control message. Total messages sent: {len(messages_sent) + 1}")
+    # Batch the reminders and the control summary into as few messages as
+    # possible: one round-trip on a typical day instead of one per person.
+    # On Sunday the reminders already went out, so the summary comes last.
+    if is_sunday:
+        batch_count += send_batched([control_msg])
+    else:
+        batch_count += send_batched(reminder_blocks + [control_msg])
+    
+    print(f"✅ Sent {len(reminder_blocks)} reminders with the control message in {batch_count} message(s)")
     if messages_sent:
         print(f"   Messages sent: {', '.join(messages_sent)}")
     else:
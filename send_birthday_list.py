@@ -6,8 +6,6 @@ Run this anytime to get the complete birthday overview
 
 import os
 import sys
-from main import fetch_birthdays, send_all_birthdays_list, send_message
-from datetime import datetime, timezone, timedelta
 
 def main():
     print("📋 Manual Birthday List Sender")
@@ -28,11 +26,18 @@ def main():
                 print(f'export {var}="your_value_here"')
         return
     
-    today = datetime.now(timezone.utc).date() + timedelta(hours=3)
+    # main reads its config from the environment at import time, so only
+    # import it once the variables are known to be set
+    from main import configure_logging, enrich, fetch_birthdays_cached, kyiv_today, send_all_birthdays_list, send_message
+    configure_logging()
+    
+    today = kyiv_today()
     
     try:
         print("📥 Fetching birthday data...")
-        birthdays = fetch_birthdays()
+        # Always ask the sheet for changes (a 304 still reuses the cache) so a
+        # list requested right after editing the sheet isn't stale
+        birthdays = fetch_birthdays_cached(ttl=0)
         print(f"✅ Loaded {len(birthdays)} birthdays")
     except Exception as e:
         print(f"❌ Error fetching birthdays: {e}")
@@ -46,7 +51,7 @@ def main():
     print("📤 Sending birthday list...")
     header = f"📋 Manual Birthday List Request - {today.strftime('%B %d, %Y')}\n\nHere's your complete birthday list:"
     send_message(header)
-    send_all_birthdays_list(birthdays, today)
+    send_all_birthdays_list(enrich(birthdays, today))
     print("✅ Birthday list sent successfully!")
 
 if __name__ == "__main__":